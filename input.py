@@ -1,109 +1,141 @@
-"""Baseline user display implementation with multiple inefficiencies.
+"""User display helpers for lists of user records.
 
-This module is intentionally naive and inefficient. It is designed
-to serve as a starting point for refactoring and architectural
-improvements.
+Formats users for display and export, looks users up by ID, and
+filters them by simple criteria. Output formats are fixed, and
+records are expected to carry the standard user fields.
 """
 
-import time
+# Fixed pieces of the export_users_to_string output, built once.
+_EXPORT_HEADER = "USER_EXPORT_START\n" + "=" * 80 + "\n"
+_EXPORT_FOOTER = "USER_EXPORT_END\n"
+_RECORD_RULE = "-" * 80 + "\n"
+
+# Verbose display_users progress lines are printed this many at a time.
+_PROGRESS_BATCH = 1000
 
 
 def display_users(users, show_all=True, verbose=False):
     """
     Display all users in a single large string.
 
-    This implementation is intentionally inefficient:
-    - Uses string concatenation in a loop
-    - Sleeps on every user to simulate slow processing
-    - Repeats field extraction for each user
-    - Has no error handling or logging
+    Each user becomes one fixed-format line. Lines are collected in a
+    list and joined once, so the cost is linear in the output size.
+    Records missing a field raise KeyError. With verbose, a progress
+    line per user is printed, in batches of up to 1000 lines;
+    lines for users already seen are still printed if a record fails.
     """
-    result = ""
-    processed_count = 0
-
-    for user in users:
-        if verbose:
-            print("Processing user:", user["id"])
-
-        # Repeated extraction of fields
-        user_id = user["id"]
-        user_name = user["name"]
-        user_email = user["email"]
-        user_role = user["role"]
-        user_status = user["status"]
-        user_join_date = user["join_date"]
-        user_last_login = user["last_login"]
-
-        # Inefficient string building and fixed formatting
-        line = "ID: " + str(user_id)
-        line += " | Name: " + user_name
-        line += " | Email: " + user_email
-        line += " | Role: " + user_role
-        line += " | Status: " + user_status
-        line += " | Join Date: " + user_join_date
-        line += " | Last Login: " + user_last_login
-
-        result += line + "\n"
-        processed_count += 1
-
-        # Artificial delay
-        time.sleep(0.01)
+    lines = []
+    progress = []
+
+    try:
+        for user in users:
+            if verbose:
+                progress.append(f"Processing user: {user['id']}")
+                if len(progress) >= _PROGRESS_BATCH:
+                    print("\n".join(progress))
+                    progress.clear()
+
+            user_id = user["id"]
+            user_name = user["name"]
+            user_email = user["email"]
+            user_role = user["role"]
+            user_status = user["status"]
+            user_join_date = user["join_date"]
+            user_last_login = user["last_login"]
+
+            # Build the whole line in one step, with fixed formatting
+            lines.append(
+                f"ID: {user_id} | Name: {user_name} | Email: {user_email}"
+                f" | Role: {user_role} | Status: {user_status}"
+                f" | Join Date: {user_join_date} | Last Login: {user_last_login}\n"
+            )
+    finally:
+        # Flush the rest, including when a record fails partway through.
+        if progress:
+            print("\n".join(progress))
 
     if show_all:
-        result += "\nTotal users processed: " + str(processed_count) + "\n"
+        lines.append(f"\nTotal users processed: {len(lines)}\n")
 
-    return result
+    return "".join(lines)
 
 
 def get_user_by_id(users, user_id):
     """
     Linear search for a user by ID.
 
-    Inefficient for large lists, and does not handle missing keys.
+    Returns the first user whose "id" equals user_id; users without an
+    "id" are skipped. For many lookups in the same list, build an index
+    once with build_user_index() and look IDs up in that instead.
     """
+    # Index directly on the common path; a KeyError means a record without
+    # an "id", which is skipped by resuming the same iterator past it.
+    remaining = iter(users)
+    while True:
+        try:
+            for user in remaining:
+                if user["id"] == user_id:
+                    return user
+            return None
+        except KeyError:
+            continue
+
+
+def build_user_index(users):
+    """
+    Map each user ID to its user, for repeated O(1) lookups.
+
+    index.get(user_id) gives the same result as get_user_by_id: the
+    first user with a given ID wins and users without an "id" are
+    skipped. IDs must be hashable. The index is a snapshot of the list;
+    rebuild it after the list or any user's "id" changes.
+    """
+    index = {}
     for user in users:
-        if user["id"] == user_id:
-            return user
-    return None
+        if "id" in user:
+            index.setdefault(user["id"], user)
+    return index
 
 
 def filter_users(users, criteria):
     """
     Filter users based on a simple criteria dictionary.
 
-    This implementation:
-    - Uses nested, repetitive condition checks
-    - Is hard to extend
-    - Does not support case sensitivity control or advanced rules
+    "role" and "status" must match exactly; "name" and "email" are
+    case-insensitive substring matches. Other keys are ignored, and the
+    matching rules are fixed. Each user is rejected at the first
+    criterion it fails.
     """
     filtered = []
 
-    for user in users:
-        include = True
-
-        if "role" in criteria:
-            if "role" not in user or user["role"] != criteria["role"]:
-                include = False
+    # Resolve the criteria once up front; the loop only inspects the user.
+    match_role = "role" in criteria
+    match_status = "status" in criteria
+    match_name = "name" in criteria
+    match_email = "email" in criteria
+    if not (match_role or match_status or match_name or match_email):
+        # Nothing to check: every user matches.
+        return list(users)
 
-        if "status" in criteria:
-            if "status" not in user or user["status"] != criteria["status"]:
-                include = False
+    role = criteria.get("role")
+    status = criteria.get("status")
+    search_value = criteria["name"].casefold() if match_name else None
+    search_email = criteria["email"].casefold() if match_email else None
 
-        if "name" in criteria:
-            name_value = user.get("name", "")
-            search_value = criteria["name"]
-            # Always case-insensitive, hard-coded behavior
-            if search_value.lower() not in name_value.lower():
-                include = False
+    for user in users:
+        # Cheap equality checks first; reject at the first failed criterion.
+        if match_role and ("role" not in user or user["role"] != role):
+            continue
+        if match_status and ("status" not in user or user["status"] != status):
+            continue
 
-        if "email" in criteria:
-            email_value = user.get("email", "")
-            search_email = criteria["email"]
-            if search_email.lower() not in email_value.lower():
-                include = False
+        # Always case-insensitive (casefold), hard-coded behavior
+        if match_name and search_value not in user.get("name", "").casefold():
+            continue
+        if match_email and search_email not in user.get("email", "").casefold():
+            continue
 
-        if include:
-            filtered.append(user)
+        filtered.append(user)
 
     return filtered
 
@@ -112,29 +144,26 @@ def export_users_to_string(users):
     """
     Export users to a multi-line string.
 
-    This implementation:
-    - Builds multiple temporary strings
-    - Has fixed formatting that cannot be customized
-    - Does not handle missing fields
+    Writes a fixed-format block per user between start and end markers.
+    Blocks are collected in a list and joined once. Records missing a
+    field raise KeyError.
     """
-    output = "USER_EXPORT_START\n"
-    output += "=" * 80 + "\n"
+    parts = [_EXPORT_HEADER]
 
     for user in users:
-        temp = ""
-        temp += "User ID: " + str(user["id"]) + "\n"
-        temp += "  Name: " + user["name"] + "\n"
-        temp += "  Email: " + user["email"] + "\n"
-        temp += "  Role: " + user["role"] + "\n"
-        temp += "  Status: " + user["status"] + "\n"
-        temp += "  Join Date: " + user["join_date"] + "\n"
-        temp += "  Last Login: " + user["last_login"] + "\n"
-        temp += "-" * 80 + "\n"
-
-        output += temp
-
-    output += "USER_EXPORT_END\n"
-    return output
+        parts.append(
+            f"User ID: {user['id']}\n"
+            f"  Name: {user['name']}\n"
+            f"  Email: {user['email']}\n"
+            f"  Role: {user['role']}\n"
+            f"  Status: {user['status']}\n"
+            f"  Join Date: {user['join_date']}\n"
+            f"  Last Login: {user['last_login']}\n"
+            f"{_RECORD_RULE}"
+        )
+
+    parts.append(_EXPORT_FOOTER)
+    return "".join(parts)
 
 
 # Sample data for manual testing and demonstration